@@ -1,26 +1,135 @@
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import HTTPError as Urllib3HTTPError, TimeoutError as Urllib3TimeoutError
+from urllib3.util.retry import Retry
 import os
 import re
+import json
+import html
+import shutil
+import threading
+from urllib.parse import urljoin, urlparse
 from datetime import datetime
 from tqdm import tqdm
 import argparse
-from concurrent.futures import ThreadPoolExecutor, as_completed
-import threading
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from operator import itemgetter
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 PodcastDownloader/1.0'
+
+def create_session(pool_size):
+    """Creates a requests session with a pooled, retrying HTTP adapter."""
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Parallel downloads mostly hit a single podcast host, where going past ~16 rarely helps
+DEFAULT_CONCURRENCY = min(16, (os.cpu_count() or 2) * 4)
+
+# Read size for streamed downloads; large enough that per-chunk Python overhead is negligible
+BLOCK_SIZE = 256 * 1024
+# Episodes are written through a large buffer, and every so often the kernel is told it can drop
+# the cached pages, since freshly downloaded audio is rarely read back soon (Linux/POSIX only)
+WRITE_BUFFER_SIZE = 1024 * 1024
+FADVISE_INTERVAL = 8 * 1024 * 1024
+# Bytes a download accumulates before reporting them to the shared progress bar
+PROGRESS_INTERVAL = 1024 * 1024
+_CAN_FADVISE = hasattr(os, 'posix_fadvise')
+
+# Extensions that mark a bare entry link as downloadable audio
+_AUDIO_EXTS = frozenset({'.mp3', '.m4a', '.ogg', '.wav', '.aac', '.opus', '.flac'})
+# Extensions kept for downloaded files; anything else (.php, .aspx, ...) is saved as .mp3
+_MEDIA_EXTS = _AUDIO_EXTS | {'.m4b', '.mp4', '.m4v', '.mov', '.webm'}
+
+# HTML cleanup patterns for episode descriptions and shownotes, compiled once at import
+_TAG_RE = re.compile(r'<[^>]+>')
+_WS_RE = re.compile(r'\s+')
+# Shownote HTML is converted in a single pass: one alternation over the elements we render
+# (headers, list items, list/paragraph/line breaks, links), with any other tag dropped. Header, list
+# item and link text stops at the next opening tag of its kind, so unclosed ones can't each scan to the
+# end of the line; a list item may also end there, since HTML lets </li> be omitted
+_HTML_RE = re.compile(
+    r'(?P<h><h[1-6][^>\n]*>(?P<h_text>(?:(?!<h[1-6]\b).)*?)</h[1-6]>)'
+    r'|(?P<li><li[^>\n]*>(?P<li_text>(?:(?!<li\b).)*?)(?:</li>|(?=<li\b)))'
+    r'|(?P<newline><[uo]l[^>\n]*>|</[uo]l>|<p[^>\n]*>|</p>|<br\s*/?>)'
+    r'|(?P<a><a\b[^>\n]*?href=["\'](?P<a_href>[^"\']*)["\'][^>\n]*>(?P<a_text>(?:(?!<a\b).)*?)</a>)'
+    r'|(?P<tag><[^>]+>)'
+)
+# Shownotes beyond this many characters (e.g. full transcripts) are cut before conversion
+MAX_SHOWNOTES_CHARS = 256 * 1024
+_MULTI_NL_RE = re.compile(r'\n\s*\n\s*\n+')
+_TRIM_LINE_RE = re.compile(r'^\s+|\s+$', flags=re.MULTILINE)
+
+FEED_CACHE_FILENAME = '.feedcache.json'
+MANIFEST_FILENAME = '.downloaded.json'
+# Suffix for episodes still being downloaded; a file only gets its final name once complete
+PART_SUFFIX = '.part'
+
+def load_state_file(path):
+    """Loads a JSON state file, returning an empty dict if it is missing or unreadable."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_state_file(path, state):
+    """
+    Writes a JSON state file, creating its directory if needed. The file is replaced
+    atomically, so an interrupted write never leaves a truncated one behind.
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=2)
+    os.replace(temp_path, path)
+
+# Characters that are invalid in filenames on common filesystems, mapped to None for str.translate
+_SANITIZE_TABLE = str.maketrans('', '', '\\/*?:"<>|')
+
+def _html_sub(match):
+    """Replacement callback for _HTML_RE, rendering one matched element as text."""
+    kind = match.lastgroup
+    if kind == 'h':
+        return f"\n\n=== {_html_to_text(match.group('h_text'))} ===\n"
+    if kind == 'li':
+        return f"  • {_html_to_text(match.group('li_text'))}\n"
+    if kind == 'newline':
+        return '\n'
+    if kind == 'a':
+        return f"{_html_to_text(match.group('a_text'))} ({match.group('a_href')})"
+    return ''
+
+def _html_to_text(content):
+    """Converts shownote HTML to readable text, keeping headers, list items and links."""
+    return _HTML_RE.sub(_html_sub, content)
 
 def sanitize_filename(filename):
     """Removes invalid characters from a filename."""
-    return re.sub(r'[\\/*?:"<>|]', "", filename)
+    return filename.translate(_SANITIZE_TABLE)
 
-def save_episode_metadata(episode_entry, output_path, episode_title, publish_date):
-    """Saves episode metadata to a txt file alongside the episode."""
+def save_episode_metadata(episode_entry, output_path, episode_title, publish_date, existing_files=None):
+    """
+    Saves episode metadata to a txt file alongside the episode. If given, existing_files
+    (filenames in output_path mapped to their sizes) is used instead of checking the disk.
+    """
     try:
         safe_episode_title = sanitize_filename(episode_title)
         metadata_filename = f"{safe_episode_title}.txt"
         metadata_path = os.path.join(output_path, metadata_filename)
         
         # Skip if metadata file already exists
-        if os.path.exists(metadata_path):
+        if existing_files is not None:
+            metadata_exists = metadata_filename in existing_files
+        else:
+            metadata_exists = os.path.lexists(metadata_path)
+        if metadata_exists:
             return True
         
         # Extract available metadata
@@ -36,11 +145,11 @@ def save_episode_metadata(episode_entry, output_path, episode_title, publish_dat
             short_description = episode_entry.summary
         
         if short_description:
-            # Clean up HTML tags if present
-            import html
-            short_description = html.unescape(short_description)
-            short_description = re.sub(r'<[^>]+>', '', short_description)  # Remove HTML tags
-            short_description = re.sub(r'\s+', ' ', short_description).strip()  # Normalize whitespace
+            # Clean up HTML tags if present; unescape is pure Python, so skip it without entities
+            if '&' in short_description:
+                short_description = html.unescape(short_description)
+            short_description = _TAG_RE.sub('', short_description)  # Remove HTML tags
+            short_description = _WS_RE.sub(' ', short_description).strip()  # Normalize whitespace
             metadata_lines.append(f"Description: {short_description}")
         
         # Store extended content for later (will be added at the end)
@@ -79,97 +188,314 @@ def save_episode_metadata(episode_entry, output_path, episode_title, publish_dat
         
         # Extended Shownotes from content:encoded (add at the end)
         if extended_content:
+            if len(extended_content) > MAX_SHOWNOTES_CHARS:
+                extended_content = extended_content[:MAX_SHOWNOTES_CHARS] + '\n[... truncated ...]'
+
             # Convert HTML to more readable text while preserving some structure
-            import html
-            extended_content = html.unescape(extended_content)
-            
-            # Convert common HTML elements to readable text
-            extended_content = re.sub(r'<h([1-6]).*?>(.*?)</h[1-6]>', r'\n\n=== \2 ===\n', extended_content)  # Headers
-            extended_content = re.sub(r'<li.*?>(.*?)</li>', r'  • \1\n', extended_content)  # List items
-            extended_content = re.sub(r'<ul.*?>', '\n', extended_content)  # Start unordered list
-            extended_content = re.sub(r'</ul>', '\n', extended_content)  # End unordered list
-            extended_content = re.sub(r'<ol.*?>', '\n', extended_content)  # Start ordered list
-            extended_content = re.sub(r'</ol>', '\n', extended_content)  # End ordered list
-            extended_content = re.sub(r'<p.*?>', '\n', extended_content)  # Paragraphs
-            extended_content = re.sub(r'</p>', '\n', extended_content)
-            extended_content = re.sub(r'<br\s*/?>', '\n', extended_content)  # Line breaks
-            extended_content = re.sub(r'<a.*?href=["\']([^"\']*)["\'].*?>(.*?)</a>', r'\2 (\1)', extended_content)  # Links
+            if '&' in extended_content:
+                extended_content = html.unescape(extended_content)
             
-            # Remove remaining HTML tags
-            extended_content = re.sub(r'<[^>]+>', '', extended_content)
+            # Convert common HTML elements to readable text and drop all other tags
+            extended_content = _html_to_text(extended_content)
             
             # Clean up whitespace
-            extended_content = re.sub(r'\n\s*\n\s*\n+', '\n\n', extended_content)  # Multiple newlines
-            extended_content = re.sub(r'^\s+|\s+$', '', extended_content, flags=re.MULTILINE)  # Trim lines
+            extended_content = _MULTI_NL_RE.sub('\n\n', extended_content)  # Multiple newlines
+            extended_content = _TRIM_LINE_RE.sub('', extended_content)  # Trim lines
             extended_content = extended_content.strip()
             
             if extended_content and extended_content != short_description:
                 metadata_lines.append(f"\nExtended Shownotes:\n{extended_content}")
         
-        # Write metadata file
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(metadata_lines))
-            f.write('\n')
+        # Write metadata file, encoded up front and written in one call
+        metadata_lines.append('')
+        metadata_bytes = '\n'.join(metadata_lines).encode('utf-8')
+        with open(metadata_path, 'wb') as f:
+            f.write(metadata_bytes)
+        if existing_files is not None:
+            existing_files[metadata_filename] = len(metadata_bytes)
         
         return True
     except Exception as e:
         # Silently fail for metadata - don't let it break episode downloads
         return False
 
-def download_episode(episode_url, output_path, episode_title):
-    """Downloads a single episode with a progress bar."""
+def _url_ext(url):
+    """Returns the extension of a URL's path, ignoring its query string and fragment."""
+    return os.path.splitext(urlparse(url).path)[1]
+
+def _pick_ext(episode_url):
+    """Returns the file extension to save an episode under, based on its URL."""
+    file_extension = _url_ext(episode_url)
+    return file_extension if file_extension.lower() in _MEDIA_EXTS else ".mp3"
+
+def _entry_date(entry):
+    """Returns an entry's publish (or update) date, or datetime.min if it has neither."""
+    parsed_date = entry.get('published_parsed') or entry.get('updated_parsed')
+    return datetime(*parsed_date[:6]) if parsed_date else datetime.min
+
+def _resolve_episode_url(entry):
+    """Picks the audio URL for a feed entry, or None if it has no downloadable media."""
+    enclosures = entry.get("enclosures", [])
+    if not enclosures:
+        # Sometimes link is directly in 'link' if no enclosures
+        if 'link' in entry and _url_ext(entry.link).lower() in _AUDIO_EXTS:
+            return entry.link
+        return None
+    for enclosure in enclosures:
+        if enclosure.get("type", "").startswith("audio"):
+            return enclosure.get("href")
+    return enclosures[0].get("href") # Fallback to first enclosure
+
+def _probe_remote_size(session, episode_url):
+    """Returns the Content-Length reported by a HEAD request, or 0 if it can't be determined."""
     try:
-        response = requests.get(episode_url, stream=True, timeout=30)
+        response = session.head(episode_url, allow_redirects=True, timeout=30)
         response.raise_for_status()
+        return int(response.headers.get('content-length', 0))
+    except (requests.exceptions.RequestException, ValueError):
+        return 0
+
+def _content_range_total(response):
+    """Returns the full resource size from a Content-Range header, or 0 if unknown."""
+    total = response.headers.get('content-range', '').rpartition('/')[2]
+    return int(total) if total.isdigit() else 0
+
+def _add_to_progress_total(progress_bar, size):
+    """Grows the shared progress bar's total once a download knows how much it will transfer."""
+    with progress_bar.get_lock():
+        progress_bar.total += size
+
+def _report_progress(progress_bar, size):
+    """Adds transferred bytes to the shared progress bar; tqdm's own update isn't atomic."""
+    with progress_bar.get_lock():
+        progress_bar.update(size)
+
+class _EpisodeWriter:
+    """
+    Write target for shutil.copyfileobj that counts the bytes written, reports them
+    to the shared progress bar in batches and periodically drops the file's cached pages.
+    """
+    def __init__(self, file, progress_bar, written):
+        self.file = file
+        self.progress_bar = progress_bar
+        self.written = written
+        self._unreported = 0
+        self._last_fadvise = written
+
+    def write(self, data):
+        self.file.write(data)
+        self.written += len(data)
+        self._unreported += len(data)
+        if self._unreported >= PROGRESS_INTERVAL:
+            self.flush_progress()
+        if _CAN_FADVISE and self.written - self._last_fadvise >= FADVISE_INTERVAL:
+            self.file.flush()
+            os.posix_fadvise(self.file.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+            self._last_fadvise = self.written
+
+    def flush_progress(self):
+        """Reports any bytes not yet shown on the progress bar."""
+        if self._unreported:
+            _report_progress(self.progress_bar, self._unreported)
+            self._unreported = 0
+
+def _if_range_validator(record):
+    """Returns the stored validator usable in If-Range: a strong ETag, else Last-Modified."""
+    etag = record.get('etag')
+    if etag and not etag.startswith('W/'):
+        return etag
+    return record.get('last_modified')
+
+def _complete_part_file(output_path, filename, existing_files):
+    """
+    Moves a finished download from its .part file to its final name. A file already under the
+    final name that couldn't be confirmed complete (e.g. from an older version of this script)
+    is left untouched until then, so a failed download never costs the copy already on disk.
+    """
+    full_output_path = os.path.join(output_path, filename)
+    os.replace(full_output_path + PART_SUFFIX, full_output_path)
+    existing_files[filename] = existing_files.pop(filename + PART_SUFFIX)
 
-        total_size = int(response.headers.get('content-length', 0))
-        block_size = 1024
-
-        safe_episode_title = sanitize_filename(episode_title)
-        file_extension = os.path.splitext(episode_url.split('?')[0])[-1]
-        if not file_extension or len(file_extension) > 5 or len(file_extension) < 2:
-            file_extension = ".mp3"
-
-        filename = f"{safe_episode_title}{file_extension}"
-        full_output_path = os.path.join(output_path, filename)
-
-        if os.path.exists(full_output_path):
-            if total_size > 0 and os.path.getsize(full_output_path) == total_size:
+def download_episode(session, episode_url, output_path, filename, existing_files, progress_bar, record, save_record):
+    """
+    Downloads a single episode to output_path/filename. Data is written to filename + PART_SUFFIX,
+    which is resumed via HTTP Range on later runs and only renamed to filename once complete.
+    existing_files maps filenames in output_path to their sizes and is kept up to date.
+    Transferred bytes are reported to progress_bar, which is shared by all downloads.
+    record is the episode's manifest entry; the ETag/Last-Modified of the body being written
+    are stored in it, and sent back as If-Range so a changed enclosure is never resumed.
+    save_record is called before a fresh .part file is written, so its validators are on disk
+    even if the run is interrupted.
+    """
+    try:
+        part_filename = filename + PART_SUFFIX
+        part_path = os.path.join(output_path, part_filename)
+
+        # Only a .part file with a stored validator is resumed; without one there's no telling
+        # whether the enclosure changed since, so the download starts over from byte 0
+        validator = _if_range_validator(record)
+        existing_size = existing_files.get(part_filename, 0) if validator else 0
+        range_headers = {}
+        if existing_size:
+            range_headers['Range'] = f'bytes={existing_size}-'
+            range_headers['If-Range'] = validator
+        response = session.get(episode_url, stream=True, timeout=30, headers=range_headers)
+
+        if response.status_code == 416:
+            # Nothing past our offset: either the file is complete or the remote one changed
+            if _content_range_total(response) == existing_size:
+                response.close()
+                _complete_part_file(output_path, filename, existing_files)
                 return True, filename, True # Added flag for skipped
+            response.close()
+            existing_size = 0
+            response = session.get(episode_url, stream=True, timeout=30)
+        response.raise_for_status()
 
-        with open(full_output_path, 'wb') as file, \
-             tqdm(total=total_size, unit='iB', unit_scale=True, desc=safe_episode_title[:40].ljust(40), leave=False) as bar:
-            for data in response.iter_content(block_size):
-                bar.update(len(data))
-                file.write(data)
+        resumed = response.status_code == 206 and response.headers.get('content-range', '').startswith(f'bytes {existing_size}-')
+        if response.status_code == 206 and not resumed:
+            # Partial reply for a range we didn't ask for, start over from scratch
+            response.close()
+            response = session.get(episode_url, stream=True, timeout=30)
+            response.raise_for_status()
 
-        if total_size != 0 and os.path.getsize(full_output_path) != total_size:
+        if resumed:
+            total_size = _content_range_total(response)
+        else:
+            # Full body (the server may not support ranges), compare against what we already have
+            total_size = int(response.headers.get('content-length', 0))
+            if existing_size and total_size > 0 and existing_size == total_size:
+                response.close()
+                _complete_part_file(output_path, filename, existing_files)
+                return True, filename, True
+            existing_size = 0
+
+        if total_size > existing_size:
+            _add_to_progress_total(progress_bar, total_size - existing_size)
+
+        if not existing_size:
+            record.clear()
+            if response.headers.get('etag'):
+                record['etag'] = response.headers['etag']
+            if response.headers.get('last-modified'):
+                record['last_modified'] = response.headers['last-modified']
+        record.pop('size', None)
+        if not existing_size:
+            save_record(record)
+
+        # Copy straight from the raw stream, skipping iter_content's per-chunk generator layers;
+        # decode_content keeps gzip/deflate transfer encodings transparent as before
+        response.raw.decode_content = True
+        with open(part_path, 'ab' if existing_size else 'wb', buffering=WRITE_BUFFER_SIZE) as file:
+            writer = _EpisodeWriter(file, progress_bar, existing_size)
+            try:
+                shutil.copyfileobj(response.raw, writer, BLOCK_SIZE)
+            finally:
+                writer.flush_progress()
+        downloaded_size = writer.written
+        existing_files[part_filename] = downloaded_size
+
+        if total_size != 0 and downloaded_size != total_size:
             print(f"Error: Size mismatch for '{filename}'. Download may be incomplete.")
-            if os.path.exists(full_output_path): # Clean up incomplete file
-                 os.remove(full_output_path)
+            if downloaded_size > total_size:
+                # More data than announced can't be resumed, clean up
+                try:
+                    os.remove(part_path)
+                except FileNotFoundError:
+                    pass
+                existing_files.pop(part_filename, None)
+            # A short .part file is kept and resumed on the next run
             return False, filename, False
+        _complete_part_file(output_path, filename, existing_files)
         return True, filename, False # Not skipped
-    except requests.exceptions.Timeout:
+    except (requests.exceptions.Timeout, Urllib3TimeoutError):
         print(f"Timeout occurred while trying to download {episode_url}")
         return False, None, False
-    except requests.exceptions.RequestException as e:
+    except (requests.exceptions.RequestException, Urllib3HTTPError) as e:
         print(f"Error downloading {episode_url}: {e}")
         return False, None, False
     except Exception as e:
-        print(f"An unexpected error occurred while downloading '{episode_title}': {e}")
+        print(f"An unexpected error occurred while downloading '{filename}': {e}")
         return False, None, False
 
-def download_podcast_episodes(feed_url, output_dir="podcast_episodes", max_concurrent=3):
+def _fetch_feed(session, feed_url, validators):
+    """
+    Fetches a feed through the pooled session, conditionally on the cached ETag/Last-Modified
+    validators, and parses the body. Returns (parsed_feed, validators), where validators are
+    the response's own for the next run; parsed_feed is None if the feed hasn't changed.
+    """
+    conditional_headers = {}
+    if validators.get('etag'):
+        conditional_headers['If-None-Match'] = validators['etag']
+    if validators.get('modified'):
+        conditional_headers['If-Modified-Since'] = validators['modified']
+    response = session.get(feed_url, headers=conditional_headers, timeout=30)
+    if response.status_code == 304:
+        return None, validators
+    response.raise_for_status()
+
+    # feedparser reads the charset from Content-Type and resolves relative links against
+    # Content-Location, which it would otherwise only know when fetching the URL itself
+    response_headers = {name.lower(): value for name, value in response.headers.items()}
+    response_headers['content-location'] = urljoin(response.url, response_headers.get('content-location', ''))
+    # Sanitizing stays on (it drops <script>/<style> bodies the text conversion would keep), as
+    # does relative-URI resolution, so shownote links are written out as absolute URLs
+    parsed_feed = feedparser.parse(response.content, response_headers=response_headers)
+    return parsed_feed, {'etag': response.headers.get('etag'), 'modified': response.headers.get('last-modified')}
+
+def _prepare_output_dir(output_dir):
+    """
+    Creates the episode directory if needed and returns (existing_files, manifest):
+    the sizes of files already in it, and the sizes and HTTP validators of
+    previous downloads keyed by episode URL.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    # One directory scan up front instead of exists/getsize calls per episode
+    existing_files = {dir_entry.name: dir_entry.stat().st_size for dir_entry in os.scandir(output_dir) if dir_entry.is_file()}
+    manifest = load_state_file(os.path.join(output_dir, MANIFEST_FILENAME))
+    return existing_files, manifest
+
+def download_podcast_episodes(feed_url, output_dir="podcast_episodes", max_concurrent=DEFAULT_CONCURRENCY):
     """
     Downloads all episodes from a podcast feed URL, oldest first,
     into the specified output directory.
     """
+    # One session per run, used for the feed as well as the episodes, so keep-alive connections
+    # are reused throughout. The pool is big enough for every worker; a smaller one would
+    # discard and reopen connections under load.
+    with create_session(max(max_concurrent, 10)) as session:
+        _download_feed_episodes(session, feed_url, output_dir, max_concurrent)
+
+def _download_feed_episodes(session, feed_url, output_dir, max_concurrent):
+    """Does the work of download_podcast_episodes() using the given session."""
+    # Feed validators live in the output directory as given, since the podcast title isn't known yet
+    feed_cache_path = os.path.join(output_dir, FEED_CACHE_FILENAME)
+    feed_cache = load_state_file(feed_cache_path)
+    cached_validators = feed_cache.get(feed_url, {})
+    # The validators only vouch for episodes that are still on disk; once the episode directory
+    # (or its manifest) is gone, e.g. deleted to fetch the podcast again, the feed is fetched unconditionally
+    cached_output_dir = cached_validators.get('output_dir')
+    if not cached_output_dir or not os.path.exists(os.path.join(cached_output_dir, MANIFEST_FILENAME)):
+        cached_validators = {}
+
     print(f"Fetching feed from: {feed_url}")
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36 PodcastDownloader/1.0'}
-        parsed_feed = feedparser.parse(feed_url, agent=headers.get('User-Agent'))
-    except Exception as e:
-        print(f"Error parsing feed: {e}")
+    prepared_output = None
+    with ThreadPoolExecutor(max_workers=1) as feed_executor:
+        feed_future = feed_executor.submit(_fetch_feed, session, feed_url, cached_validators)
+
+        # An explicit output directory doesn't depend on the podcast title, so it can be
+        # set up while the feed is still being fetched and parsed
+        if output_dir != "podcast_episodes":
+            prepared_output = _prepare_output_dir(output_dir)
+
+        try:
+            parsed_feed, feed_validators = feed_future.result()
+        except Exception as e:
+            print(f"Error fetching feed: {e}")
+            return
+
+    if parsed_feed is None:
+        print("Feed not modified since the last complete run, nothing to download.")
         return
 
     if parsed_feed.bozo:
@@ -191,109 +517,133 @@ def download_podcast_episodes(feed_url, output_dir="podcast_episodes", max_concu
         if output_dir == "podcast_episodes" and podcast_title_sanitized:
             output_dir = os.path.join("podcast_episodes", podcast_title_sanitized)
 
-    episodes = []
-    for entry in parsed_feed.entries:
-        publish_date = datetime.min
-        if hasattr(entry, 'published_parsed') and entry.published_parsed:
-            publish_date = datetime(*entry.published_parsed[:6])
-        elif hasattr(entry, 'updated_parsed') and entry.updated_parsed:
-             publish_date = datetime(*entry.updated_parsed[:6])
-        episodes.append({'entry': entry, 'date': publish_date})
-
-    sorted_episodes = sorted(episodes, key=lambda x: x['date'])
+    # Each date is computed once and carried alongside its entry; the list is sorted in place
+    sorted_episodes = [(_entry_date(entry), entry) for entry in parsed_feed.entries]
+    sorted_episodes.sort(key=itemgetter(0))
 
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    existing_files, manifest = prepared_output or _prepare_output_dir(output_dir)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILENAME)
 
     total_episodes = len(sorted_episodes)
     print(f"Found {total_episodes} episodes for '{parsed_feed.feed.get('title', 'Unknown Podcast')}'. Starting download (oldest first)...")
 
-    newly_downloaded_count = 0
-    already_existed_count = 0
-    failed_count = 0
-    
-    # Thread-safe counters
-    counter_lock = threading.Lock()
-    
-    def process_episode(episode_info):
-        i, episode_data = episode_info
-        nonlocal newly_downloaded_count, already_existed_count, failed_count
-        entry = episode_data['entry']
+    # A single walk over the sorted feed resolves everything the download loop needs, and collects
+    # the files on disk that the manifest doesn't vouch for. Those get one burst of cheap HEAD
+    # requests up front, rather than a streaming GET per episode just to read its size.
+    episode_list = []
+    urls_to_probe = []
+    # Outcomes are tallied here on the calling thread, so workers share no counters
+    results = Counter()
+    for i, (publish_date, entry) in enumerate(sorted_episodes):
         episode_title = entry.get("title", f"Untitled Episode {i+1}")
 
         # Construct a date prefix for filenames (YYYY-MM-DD)
-        date_str = episode_data['date'].strftime('%Y-%m-%d') if episode_data['date'] != datetime.min else "nodate"
+        date_str = publish_date.strftime('%Y-%m-%d') if publish_date != datetime.min else "nodate"
         prefixed_episode_title = f"{date_str} - {episode_title}"
 
-
-        enclosures = entry.get("enclosures", [])
-        if not enclosures:
-            # Sometimes link is directly in 'link' if no enclosures
-            if 'link' in entry and entry.link.endswith(('.mp3', '.m4a', '.ogg', '.wav', '.aac')): # Basic check
-                episode_url = entry.link
-            else:
-                with counter_lock:
-                    failed_count += 1
-                return
-        else:
-            episode_url = None
-            for enclosure in enclosures:
-                if enclosure.get("type", "").startswith("audio"):
-                    episode_url = enclosure.get("href")
-                    break
-            if not episode_url:
-                episode_url = enclosures[0].get("href") # Fallback to first enclosure
-
+        episode_url = _resolve_episode_url(entry)
         if not episode_url:
-            with counter_lock:
-                failed_count += 1
-            return
+            # Nothing to download, so don't occupy a worker with it
+            results['no_link'] += 1
+            continue
+        # The extension only depends on the URL, so it is picked here once rather than in the worker
+        filename = f"{sanitize_filename(prefixed_episode_title)}{_pick_ext(episode_url)}"
+        if episode_url not in manifest and filename in existing_files:
+            urls_to_probe.append(episode_url)
+        episode_list.append((entry, publish_date, prefixed_episode_title, episode_url, filename))
+
+    remote_sizes = {}
+    # Records are written to disk as downloads start and finish, so an interrupted run keeps the
+    # validators needed to resume its .part files; the lock also keeps json.dump from seeing the
+    # manifest change size mid-write
+    manifest_lock = threading.Lock()
+
+    def save_manifest():
+        """Writes the manifest to disk, warning instead of failing if it can't be saved."""
+        try:
+            save_state_file(manifest_path, manifest)
+        except OSError as e:
+            print(f"Warning: Could not save download manifest: {e}")
+
+    def store_record(episode_url, record, save=True):
+        """Puts a copy of an episode's record in the manifest and, if save, writes it to disk."""
+        with manifest_lock:
+            manifest[episode_url] = dict(record)
+            if save:
+                save_manifest()
+
+    def process_episode(episode_info, session, progress_bar):
+        """Handles one episode and returns its outcome: 'new', 'skipped' or 'failed'."""
+        entry, publish_date, prefixed_episode_title, episode_url, filename = episode_info
+
+        # Episodes whose file matches the manifest or the HEAD probe are skipped without a download.
+        # Workers only ever touch their own record; the manifest gets copies of it via store_record.
+        record = dict(manifest.get(episode_url, {}))
+        expected_size = record.get('size') or remote_sizes.get(episode_url)
+        if expected_size and existing_files.get(filename) == expected_size:
+            save_episode_metadata(entry, output_dir, prefixed_episode_title, publish_date, existing_files)
+            record['size'] = expected_size
+            store_record(episode_url, record, save=False)
+            return 'skipped'
+
+        success, downloaded_filename, skipped_due_to_existence = download_episode(session, episode_url, output_dir, filename, existing_files, progress_bar, record,
+                                                                                  lambda part_record: store_record(episode_url, part_record))
+        if success:
+            record['size'] = existing_files[downloaded_filename]
+        # Kept even on failure, so a partial download can be resumed with If-Range next time
+        if record:
+            store_record(episode_url, record)
+        if not success:
+            return 'failed'
 
-        success, downloaded_filename, skipped_due_to_existence = download_episode(episode_url, output_dir, prefixed_episode_title)
-        
         # Save metadata alongside the episode (whether new download or existing)
-        if success:
-            save_episode_metadata(entry, output_dir, prefixed_episode_title, episode_data['date'])
-
-        with counter_lock:
-            if success:
-                if skipped_due_to_existence:
-                    already_existed_count += 1
-                else:
-                    newly_downloaded_count += 1
+        save_episode_metadata(entry, output_dir, prefixed_episode_title, publish_date, existing_files)
+        return 'skipped' if skipped_due_to_existence else 'new'
+
+    # One aggregate bar for all downloads; its total grows as each download learns its size.
+    with tqdm(total=0, unit='iB', unit_scale=True, desc="Downloading", leave=False, mininterval=0.5) as progress_bar:
+        if urls_to_probe:
+            with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+                sizes = executor.map(lambda episode_url: _probe_remote_size(session, episode_url), urls_to_probe)
+                remote_sizes.update(zip(urls_to_probe, sizes))
+
+        def run_episode(episode_info):
+            """Runs process_episode, counting an unexpected error as a failure."""
+            try:
+                return process_episode(episode_info, session, progress_bar)
+            except Exception:
+                return 'failed'
+
+        # Process episodes with ThreadPoolExecutor; the manifest is saved even if the run is cut short
+        try:
+            if max_concurrent == 1:
+                # Sequential processing (original behavior)
+                results.update(map(run_episode, episode_list))
             else:
-                failed_count += 1
-    
-    # Process episodes with ThreadPoolExecutor
-    episode_list = list(enumerate(sorted_episodes))
-    
-    if max_concurrent == 1:
-        # Sequential processing (original behavior)
-        for episode_info in episode_list:
-            process_episode(episode_info)
-    else:
-        # Parallel processing
-        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
-            futures = [executor.submit(process_episode, episode_info) for episode_info in episode_list]
-            
-            # Wait for all downloads to complete
-            for future in as_completed(futures):
-                try:
-                    future.result()
-                except Exception as e:
-                    with counter_lock:
-                        failed_count += 1
-
+                # Parallel processing; run_episode never raises, so outcomes are tallied straight from map
+                with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
+                    results.update(executor.map(run_episode, episode_list))
+        finally:
+            with manifest_lock:
+                save_manifest()
 
     print("\n--- Download Summary ---")
     print(f"Podcast: {parsed_feed.feed.get('title', 'Unknown Podcast')}")
     print(f"Output Directory: {os.path.abspath(output_dir)}")
     print(f"Total episodes in feed: {total_episodes}")
-    print(f"Successfully downloaded (new): {newly_downloaded_count}")
-    print(f"Already existed & complete (skipped): {already_existed_count}")
-    print(f"Failed/Skipped (no link/error): {failed_count}")
+    print(f"Successfully downloaded (new): {results['new']}")
+    print(f"Already existed & complete (skipped): {results['skipped']}")
+    print(f"Failed/Skipped (no link/error): {results['failed'] + results['no_link']}")
     print("------------------------")
 
+    # Only remember the feed version once every downloadable episode is on disk, so failures get retried
+    if results['failed'] == 0 and (feed_validators['etag'] or feed_validators['modified']):
+        feed_cache[feed_url] = dict(feed_validators, output_dir=output_dir)
+        try:
+            save_state_file(feed_cache_path, feed_cache)
+        except OSError as e:
+            print(f"Warning: Could not save feed cache: {e}")
+
 
 def main():
     """Main entry point for the podcastdl CLI."""
@@ -301,8 +651,8 @@ def main():
     parser.add_argument("feed_url", help="The URL of the podcast RSS feed.")
     parser.add_argument("-o", "--output", dest="output_dir", default="podcast_episodes",
                         help="The directory to save episodes (default: ./podcast_episodes or ./podcast_episodes/PodcastTitle).")
-    parser.add_argument("-c", "--concurrent", dest="max_concurrent", type=int, default=3,
-                        help="Maximum number of concurrent downloads (default: 3, use 1 for sequential).")
+    parser.add_argument("-c", "--concurrent", dest="max_concurrent", type=int, default=DEFAULT_CONCURRENCY,
+                        help=f"Maximum number of concurrent downloads (default: {DEFAULT_CONCURRENCY}, use 1 for sequential).")
 
     args = parser.parse_args()
 